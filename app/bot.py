@@ -59,6 +59,7 @@ class ExchangeBot:
             .read_timeout(30.0)     # Read timeout: 30 seconds
             .write_timeout(30.0)    # Write timeout: 30 seconds
             .pool_timeout(30.0)     # Pool timeout: 30 seconds
+            .post_shutdown(self._post_shutdown)
             .build()
         )
         
@@ -67,6 +68,10 @@ class ExchangeBot:
         
         logger.info("Exchange Bot initialized successfully!")
     
+    async def _post_shutdown(self, application: Application):
+        """Release async resources while the event loop is still running"""
+        await self.ocr_service.aclose()
+    
     def _register_handlers(self):
         """Register all bot handlers"""
         
@@ -80,7 +85,9 @@ class ExchangeBot:
             ],
             states={
                 Config.UPLOAD_RECEIPT: [
-                    MessageHandler(filters.PHOTO, self.user_handlers.handle_receipt)
+                    # Non-blocking so OCR for one user doesn't hold up updates from
+                    # everyone else; this user's conversation waits until it resolves
+                    MessageHandler(filters.PHOTO, self.user_handlers.handle_receipt, block=False)
                 ],
                 Config.ENTER_AMOUNT: [
                     MessageHandler(
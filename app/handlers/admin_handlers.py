@@ -93,14 +93,14 @@ class AdminHandlers:
         pending_count = 0
         
         for txn in transactions:
-            status_emoji = "✅" if txn[13] == 'confirmed' else "⏳" if txn[13] == 'pending' else "❌"
-            message += f"{status_emoji} **#{txn[0]}** - {txn[6]} THB → {txn[7]:,.0f} MMK - `{txn[13]}`\n"
+            status_emoji = "✅" if txn.status == 'confirmed' else "⏳" if txn.status == 'pending' else "❌"
+            message += f"{status_emoji} **#{txn.id}** - {txn.thb_amount} THB → {txn.mmk_amount:,.0f} MMK - `{txn.status}`\n"
             
-            if txn[13] == 'confirmed':
-                total_thb += txn[6]
-                total_mmk += txn[7]
+            if txn.status == 'confirmed':
+                total_thb += txn.thb_amount
+                total_mmk += txn.mmk_amount
                 confirmed_count += 1
-            elif txn[13] == 'pending':
+            elif txn.status == 'pending':
                 pending_count += 1
         
         message += f"\n**Summary:**\n"
@@ -149,7 +149,7 @@ class AdminHandlers:
                 # Get the most recent pending transaction for this user
                 recent_txn = self.db.get_user_recent_pending_transaction(user_id)
                 if recent_txn:
-                    transaction_id = recent_txn[0]  # transaction ID is first column
+                    transaction_id = recent_txn['id']
                     logger.info(f"Found transaction #{transaction_id} for user {user_id} from message text")
         
         if not transaction_id:
@@ -163,10 +163,7 @@ class AdminHandlers:
             return
         
         # Check if transaction is already confirmed (not just pending)
-        # Column indices: 0=id, 1=user_id, 2=username, 3=receipt_path, 4=admin_receipt_path,
-        # 5=from_bank, 6=to_bank, 7=thb_amount, 8=mmk_amount, 9=rate, 10=user_bank_name,
-        # 11=user_account_number, 12=user_account_name, 13=admin_bank, 14=admin_thb_bank, 15=status
-        status = transaction[15]  # status column (16th column, index 15)
+        status = transaction.status
         if status == 'confirmed':
             await update.message.reply_text(f"❌ Transaction #{transaction_id} is already confirmed.")
             return
@@ -225,9 +222,9 @@ class AdminHandlers:
         reply_markup = InlineKeyboardMarkup(keyboard)
         
         # Get transaction details for display
-        thb_amount = transaction[7]  # thb_amount at index 7
-        mmk_amount = transaction[8]  # mmk_amount at index 8
-        user_bank = transaction[10]  # user_bank_name at index 10
+        thb_amount = transaction.thb_amount
+        mmk_amount = transaction.mmk_amount
+        user_bank = transaction.user_bank_name
         
         await update.message.reply_text(
             f"✅ **Receipt saved for Transaction #{transaction_id}**\n\n"
@@ -255,11 +252,10 @@ class AdminHandlers:
             await query.edit_message_text("❌ Transaction not found.")
             return
         
-        # Correct column indices based on actual schema
-        user_id = transaction[1]
-        thb_amount = transaction[7]  # thb_amount column (index 7)
-        mmk_amount = transaction[8]  # mmk_amount column (index 8)
-        admin_thb_bank = transaction[14]  # admin_thb_bank column (index 14)
+        user_id = transaction.user_id
+        thb_amount = transaction.thb_amount
+        mmk_amount = transaction.mmk_amount
+        admin_thb_bank = transaction.admin_thb_bank
         
         # Get balances before update
         balances_before = self.db.get_balances()
@@ -437,7 +433,7 @@ Transaction #{transaction_id} cannot be processed
         # Notify user
         transaction = self.db.get_transaction(transaction_id)
         if transaction:
-            user_id = transaction[1]
+            user_id = transaction.user_id
             try:
                 await context.bot.send_message(
                     chat_id=user_id,
@@ -129,7 +129,7 @@ Ready to exchange? Click the button below!
         processing_msg = await update.message.reply_text("🔍 Processing your receipt... Please wait.")
         
         # Extract receipt info using Mistral AI
-        receipt_info = self.ocr.extract_receipt_info(file_path)
+        receipt_info = await self.ocr.extract_receipt_info_async(file_path)
         
         if not receipt_info:
             await self._send_message_with_retry(
@@ -417,7 +417,7 @@ Name: {account_name}
             
             # Get receipt path from transaction in database
             transaction = self.db.get_transaction(transaction_id)
-            receipt_path = transaction[3] if transaction else None  # receipt_path is at index 3
+            receipt_path = transaction.receipt_path if transaction else None
             
             logger.info(f"Notifying admin for transaction #{transaction_id}, receipt_path: {receipt_path}")
             
@@ -1,19 +1,83 @@
 """
 OCR service for receipt processing using OpenAI Vision with LangChain
 """
+import asyncio
 import base64
+import hashlib
 import json
 import logging
-from typing import Optional, Dict
+import re
+import time
+from typing import Optional, Dict, List, Tuple
 from PIL import Image
 import io
 
+try:
+    import orjson
+except ImportError:  # Optional speed-up; fall back to the stdlib codec
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# JSON object wrapped in a markdown code fence (```json ... ``` or ``` ... ```)
+# Non-greedy: with several fenced blocks, take the first object. The closing
+# fence may be missing when the reply is cut off, so end-of-text also counts
+_FENCE_RE = re.compile(r"```(?:json)?\s*(\{.*?\})\s*(?:```|$)", re.S)
+
+def _json_loads(data):
+    """Parse JSON with orjson when available (raises json.JSONDecodeError on bad input)"""
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def _json_dumps(obj) -> bytes:
+    """Serialize JSON to UTF-8 bytes with orjson when available"""
+    return orjson.dumps(obj) if orjson else json.dumps(obj).encode("utf-8")
+
+
+# OpenAI high detail limits (longest side, shortest side) in pixels
+MAX_IMAGE_SIDE = 2048
+MAX_IMAGE_SHORT_SIDE = 768
+
+# GPT-4o-mini supports vision and is cost-effective
+MODEL_NAME = "gpt-4o-mini"
+
+RECEIPT_PROMPT = """Analyze this Thai bank transfer receipt and extract the following information:
+
+1. Transfer amount (in THB) - extract only the number
+2. Sender bank name - the bank sending the money
+3. Receiver bank name - the bank receiving the money
+4. Sender account name - the person/account sending money
+5. Receiver account name - the person/account receiving money
+6. Transaction status - whether it's successful, pending, or failed
+7. Transaction reference number
+
+Important:
+- For bank names, use common abbreviations if visible (e.g., SCB, KTB, KBank)
+- For names, extract exactly as shown (including titles like MISS, MR, etc.)
+- For amount, extract only the numeric value
+
+Return ONLY valid JSON format with no additional text:
+{
+    "amount": <number or null>,
+    "sender_bank": "<bank name or null>",
+    "receiver_bank": "<bank name or null>",
+    "sender_name": "<name or null>",
+    "receiver_name": "<name or null>",
+    "status": "<status or null>",
+    "reference": "<ref or null>"
+}"""
+
 
 class OCRService:
     """Handle OCR operations using OpenAI Vision with LangChain"""
     
+    # Results cache for re-uploaded receipts (keyed by SHA-256 of the file)
+    CACHE_TTL_SECONDS: int = 3600
+    CACHE_MAX_ENTRIES: int = 256
+    
+    # The service owns HTTP pools and a result cache; one instance per process is expected
+    _instance_count: int = 0
+    
     def __init__(self, api_key: str):
         """
         Initialize OCR service
@@ -21,17 +85,33 @@ class OCRService:
         Args:
             api_key: OpenAI API key
         """
+        OCRService._instance_count += 1
+        if OCRService._instance_count > 1:
+            logger.warning(
+                f"OCRService instantiated {OCRService._instance_count} times; "
+                f"share the instance created by ExchangeBot instead"
+            )
+        
         try:
+            import httpx
             from langchain_openai import ChatOpenAI
             from langchain.schema import HumanMessage
             
             self.api_key = api_key
+            self._cache: Dict[str, Tuple[float, Dict]] = {}
+            self._batch_client = None
+            # Shared keep-alive HTTP client so TLS handshakes are reused across receipts
+            limits = httpx.Limits(max_connections=8, max_keepalive_connections=4)
+            self._http_client = httpx.Client(limits=limits)
+            self._http_async_client = httpx.AsyncClient(limits=limits)
             # Initialize LangChain ChatOpenAI with vision model
             self.llm = ChatOpenAI(
-                model="gpt-4o-mini",  # GPT-4o-mini supports vision and is cost-effective
+                model=MODEL_NAME,
                 api_key=api_key,
                 temperature=0,  # Deterministic output for structured data
-                max_tokens=1000
+                max_tokens=1000,
+                http_client=self._http_client,
+                http_async_client=self._http_async_client
             )
             self.HumanMessage = HumanMessage
             logger.info("OCR Service initialized successfully with OpenAI GPT-4o-mini")
@@ -43,7 +123,53 @@ class OCRService:
             logger.error(f"Error initializing OCR service: {e}")
             raise
     
-    def image_to_base64(self, image_path: str) -> str:
+    def close(self):
+        """Close pooled HTTP connections (call on shutdown)"""
+        self._http_client.close()
+        logger.info("OCR service HTTP client closed")
+    
+    async def aclose(self):
+        """Close pooled async HTTP connections (call from the event loop on shutdown)"""
+        await self._http_async_client.aclose()
+        logger.info("OCR service async HTTP client closed")
+    
+    def _file_digest(self, image_path: str) -> str:
+        """Return SHA-256 hex digest of the raw image file"""
+        with open(image_path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    
+    def _cache_get(self, digest: str) -> Optional[Dict]:
+        """Return a copy of a cached OCR result, or None if missing/expired"""
+        entry = self._cache.get(digest)
+        if entry is None:
+            return None
+        
+        expires_at, result = entry
+        if expires_at < time.monotonic():
+            self._cache.pop(digest, None)
+            return None
+        
+        return dict(result)
+    
+    def _cache_put(self, digest: str, result: Dict):
+        """Store an OCR result, evicting the oldest entry when full"""
+        if len(self._cache) >= self.CACHE_MAX_ENTRIES:
+            self._cache.pop(next(iter(self._cache)))
+        self._cache[digest] = (time.monotonic() + self.CACHE_TTL_SECONDS, dict(result))
+    
+    @staticmethod
+    def _target_size(size: Tuple[int, int]) -> Tuple[int, int]:
+        """
+        Size at which OpenAI high detail processes an image
+        
+        The API fits images within 2048x2048 and then scales the shortest side
+        down to 768px, so any resolution beyond that is uploaded for nothing.
+        """
+        width, height = size
+        scale = min(1.0, MAX_IMAGE_SIDE / max(width, height), MAX_IMAGE_SHORT_SIDE / min(width, height))
+        return max(1, round(width * scale)), max(1, round(height * scale))
+    
+    def image_to_base64(self, image_path: str) -> bytes:
         """
         Convert image to base64 for OpenAI Vision
         
@@ -51,25 +177,117 @@ class OCRService:
             image_path: Path to image file
             
         Returns:
-            Base64 encoded image string
+            Base64 encoded image as ASCII bytes
         """
         try:
             with Image.open(image_path) as img:
+                # Resize to what OpenAI high detail actually uses
+                target_size = self._target_size(img.size)
+                
+                # Already a small RGB/greyscale JPEG: send the file as-is, no decode/re-encode
+                if (img.format == 'JPEG' and img.mode in ('RGB', 'L')
+                        and target_size == img.size):
+                    with open(image_path, 'rb') as f:
+                        return base64.b64encode(f.read())
+                
                 # Convert to RGB if necessary
                 if img.mode in ('RGBA', 'LA', 'P'):
                     img = img.convert('RGB')
                 
-                # Resize if too large (OpenAI recommends max 2048x2048)
-                max_size = (2048, 2048)
-                img.thumbnail(max_size, Image.Resampling.LANCZOS)
+                # For JPEGs, thumbnail() lets libjpeg downscale while decoding but
+                # keeps at least reducing_gap x the target size, so LANCZOS still
+                # has enough detail for small receipt text
+                img.thumbnail(target_size, Image.Resampling.LANCZOS, reducing_gap=2.0)
                 
                 buffered = io.BytesIO()
                 img.save(buffered, format="JPEG", quality=90)
-                return base64.b64encode(buffered.getvalue()).decode()
+                # Encode straight from the BytesIO buffer without copying it out
+                with buffered.getbuffer() as view:
+                    return base64.b64encode(view)
         except Exception as e:
             logger.error(f"Error converting image to base64: {e}")
             raise
     
+    def _build_content(self, image_path: str) -> List[Dict]:
+        """
+        Build the multimodal message content for a receipt image
+        
+        Args:
+            image_path: Path to receipt image
+        
+        Returns:
+            OpenAI chat content parts (prompt text + image)
+        """
+        image_base64 = self.image_to_base64(image_path)
+        # Build the data URL in bytes and decode once (ASCII fast path)
+        image_url = (b"data:image/jpeg;base64," + image_base64).decode("ascii")
+        
+        return [
+            {
+                "type": "text",
+                "text": RECEIPT_PROMPT
+            },
+            {
+                "type": "image_url",
+                "image_url": {
+                    "url": image_url,
+                    "detail": "high"  # Use high detail for better OCR
+                }
+            }
+        ]
+    
+    def _parse_content(self, content: str) -> Dict:
+        """
+        Parse the model's JSON answer
+        
+        Raises:
+            json.JSONDecodeError: If the content is not valid JSON
+        """
+        # Sometimes the model returns markdown code blocks
+        match = _FENCE_RE.search(content)
+        payload = match.group(1) if match else content.strip()
+        
+        return _json_loads(payload)
+    
+    def _prepare_request(self, image_path: str) -> Tuple[str, Optional[Dict], Optional[object]]:
+        """
+        Blocking pre-processing shared by the sync and async extract paths
+        
+        Args:
+            image_path: Path to receipt image
+            
+        Returns:
+            (digest, cached result, message). On a cache hit the message is
+            None and the cached result should be returned as-is
+        """
+        # Identical re-uploads reuse the previous result instead of a paid API call
+        digest = self._file_digest(image_path)
+        cached = self._cache_get(digest)
+        if cached is not None:
+            logger.info(f"OCR cache hit for {image_path}")
+            return digest, cached, None
+        
+        # Create message with image using LangChain
+        return digest, None, self.HumanMessage(content=self._build_content(image_path))
+    
+    def _handle_response(self, digest: str, content: str) -> Optional[Dict]:
+        """
+        Parse the model's answer and cache it, shared by the sync and async paths
+        
+        Returns:
+            Dictionary with extracted information or None if it isn't valid JSON
+        """
+        try:
+            result = self._parse_content(content)
+        except json.JSONDecodeError as e:
+            logger.error(f"JSON parsing error: {e}")
+            logger.error(f"Response content: {content}")
+            return None
+        
+        logger.info(f"OCR extraction successful: {result}")
+        self._cache_put(digest, result)
+        return result
+    
     def extract_receipt_info(self, image_path: str) -> Optional[Dict]:
         """
         Extract information from receipt using OpenAI Vision with LangChain
@@ -81,71 +299,156 @@ class OCRService:
             Dictionary with extracted information or None if failed
         """
         try:
-            image_base64 = self.image_to_base64(image_path)
-            
-            # Construct the prompt
-            prompt_text = """Analyze this Thai bank transfer receipt and extract the following information:
-
-1. Transfer amount (in THB) - extract only the number
-2. Sender bank name - the bank sending the money
-3. Receiver bank name - the bank receiving the money
-4. Sender account name - the person/account sending money
-5. Receiver account name - the person/account receiving money
-6. Transaction status - whether it's successful, pending, or failed
-7. Transaction reference number
-
-Important:
-- For bank names, use common abbreviations if visible (e.g., SCB, KTB, KBank)
-- For names, extract exactly as shown (including titles like MISS, MR, etc.)
-- For amount, extract only the numeric value
-
-Return ONLY valid JSON format with no additional text:
-{
-    "amount": <number or null>,
-    "sender_bank": "<bank name or null>",
-    "receiver_bank": "<bank name or null>",
-    "sender_name": "<name or null>",
-    "receiver_name": "<name or null>",
-    "status": "<status or null>",
-    "reference": "<ref or null>"
-}"""
-            
-            # Create message with image using LangChain
-            message = self.HumanMessage(
-                content=[
-                    {
-                        "type": "text",
-                        "text": prompt_text
-                    },
-                    {
-                        "type": "image_url",
-                        "image_url": {
-                            "url": f"data:image/jpeg;base64,{image_base64}",
-                            "detail": "high"  # Use high detail for better OCR
-                        }
-                    }
-                ]
-            )
+            digest, cached, message = self._prepare_request(image_path)
+            if message is None:
+                return cached
             
             # Invoke the model
             response = self.llm.invoke([message])
-            content = response.content
+            return self._handle_response(digest, response.content)
             
-            # Try to parse JSON from response
-            # Sometimes the model returns markdown code blocks
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0].strip()
-            elif "```" in content:
-                content = content.split("```")[1].split("```")[0].strip()
+        except Exception as e:
+            logger.error(f"OCR Error: {e}")
+            return None
+    
+    async def extract_receipt_info_async(self, image_path: str) -> Optional[Dict]:
+        """
+        Async variant of extract_receipt_info for use inside bot handlers
+        
+        File hashing and image processing run in a worker thread and the model
+        call uses the async HTTP client, so the event loop keeps serving other
+        users while a receipt is being read.
+        
+        Args:
+            image_path: Path to receipt image
             
-            result = json.loads(content)
-            logger.info(f"OCR extraction successful: {result}")
-            return result
+        Returns:
+            Dictionary with extracted information or None if failed
+        """
+        try:
+            digest, cached, message = await asyncio.to_thread(self._prepare_request, image_path)
+            if message is None:
+                return cached
+            
+            # Invoke the model
+            response = await self.llm.ainvoke([message])
+            return self._handle_response(digest, response.content)
             
-        except json.JSONDecodeError as e:
-            logger.error(f"JSON parsing error: {e}")
-            logger.error(f"Response content: {content if 'content' in locals() else 'N/A'}")
-            return None
         except Exception as e:
             logger.error(f"OCR Error: {e}")
             return None
+    
+    def extract_receipt_info_batch(
+        self,
+        image_paths: List[str],
+        poll_interval: float = 5.0,
+        max_wait: float = 24 * 3600
+    ) -> List[Optional[Dict]]:
+        """
+        Extract information from many receipts through the OpenAI Batch API
+        
+        Batch jobs cost half of the interactive API but complete asynchronously
+        (up to 24 hours), so use this only for background/admin re-processing.
+        Interactive user flows should keep using extract_receipt_info.
+        
+        Args:
+            image_paths: Paths to receipt images
+            poll_interval: Initial delay between status checks in seconds
+            max_wait: Give up waiting after this many seconds
+        
+        Returns:
+            List of extracted dictionaries (None for failures), in input order
+        """
+        results: List[Optional[Dict]] = [None] * len(image_paths)
+        digests: Dict[int, str] = {}
+        lines = []
+        
+        for index, image_path in enumerate(image_paths):
+            try:
+                digest = self._file_digest(image_path)
+                cached = self._cache_get(digest)
+                if cached is not None:
+                    results[index] = cached
+                    continue
+                
+                digests[index] = digest
+                lines.append(_json_dumps({
+                    "custom_id": str(index),
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": {
+                        "model": MODEL_NAME,
+                        "temperature": 0,
+                        "max_tokens": 1000,
+                        "messages": [
+                            {"role": "user", "content": self._build_content(image_path)}
+                        ]
+                    }
+                }))
+            except Exception as e:
+                logger.error(f"Error preparing {image_path} for batch OCR: {e}")
+        
+        if not lines:
+            return results
+        
+        try:
+            client = self._get_batch_client()
+            batch_file = client.files.create(
+                file=("receipts.jsonl", b"\n".join(lines)),
+                purpose="batch"
+            )
+            batch = client.batches.create(
+                input_file_id=batch_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h"
+            )
+            logger.info(f"Submitted OCR batch {batch.id} with {len(lines)} receipt(s)")
+            
+            # Poll with exponential backoff until the batch finishes
+            delay = poll_interval
+            deadline = time.monotonic() + max_wait
+            while batch.status not in ("completed", "failed", "expired", "cancelled"):
+                if time.monotonic() >= deadline:
+                    logger.error(f"OCR batch {batch.id} still {batch.status} after {max_wait:.0f}s")
+                    return results
+                time.sleep(delay)
+                delay = min(delay * 2, 60.0)
+                batch = client.batches.retrieve(batch.id)
+            
+            if batch.status != "completed" or not batch.output_file_id:
+                logger.error(f"OCR batch {batch.id} ended with status {batch.status}")
+                return results
+            
+            output = client.files.content(batch.output_file_id).text
+        except Exception as e:
+            logger.error(f"Batch OCR Error: {e}")
+            return results
+        
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            try:
+                item = _json_loads(line)
+                index = int(item["custom_id"])
+                response = item.get("response") or {}
+                if response.get("status_code") != 200:
+                    logger.error(f"Batch OCR failed for {image_paths[index]}: {item.get('error')}")
+                    continue
+                
+                content = response["body"]["choices"][0]["message"]["content"]
+                result = self._parse_content(content)
+                results[index] = result
+                self._cache_put(digests[index], result)
+            except Exception as e:
+                logger.error(f"Error parsing batch OCR result: {e}")
+        
+        logger.info(f"OCR batch {batch.id} completed: "
+                    f"{sum(r is not None for r in results)}/{len(image_paths)} receipt(s) extracted")
+        return results
+    
+    def _get_batch_client(self):
+        """Create the OpenAI client used for batch jobs on first use"""
+        if self._batch_client is None:
+            from openai import OpenAI
+            self._batch_client = OpenAI(api_key=self.api_key, http_client=self._http_client)
+        return self._batch_client
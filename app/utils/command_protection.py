@@ -10,111 +10,72 @@ from app.config.settings import Config
 
 logger = logging.getLogger(__name__)
 
+# Replies sent when a handler is used in the wrong chat, keyed by (require_admin, is_callback)
+_BLOCKED_MESSAGES = {
+    (True, False): "⚠️ This command can only be used in the admin group.",
+    (False, False): (
+        "⚠️ This command can only be used in private chat with the bot.\n\n"
+        "Please message me directly: @balance_transfer_tg_bot"
+    ),
+    (True, True): "⚠️ This action can only be performed in the admin group.",
+    (False, True): "⚠️ This action can only be performed in private chat with the bot.",
+}
 
-def admin_only(func):
-    """
-    Decorator to ensure command only runs in admin group
-    Blocks execution in private chats
-    """
-    @wraps(func)
-    async def wrapper(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        chat_id = str(update.effective_chat.id)
-        chat_type = update.effective_chat.type
-        
-        # Get admin group ID from database or config
-        admin_group_id = self.db.get_setting('admin_group_id') or Config.ADMIN_GROUP_ID
-        
-        # Check if command is in admin group
-        if chat_id != admin_group_id:
-            logger.warning(
-                f"Admin command '{func.__name__}' blocked in chat {chat_id} "
-                f"(type: {chat_type}). Only allowed in admin group."
-            )
-            await update.message.reply_text(
-                "⚠️ This command can only be used in the admin group."
-            )
-            return
-        
-        # Execute the command
-        return await func(self, update, context)
-    
-    return wrapper
 
-
-def private_chat_only(func):
+def _chat_guard(require_admin: bool, is_callback: bool):
     """
-    Decorator to ensure command only runs in private chat with bot
-    Blocks execution in groups
+    Build a decorator that restricts a handler to the admin group or to private chats
+    
+    Args:
+        require_admin: True to allow only the admin group, False to allow only private chats
+        is_callback: True for callback query handlers, False for message/command handlers
     """
-    @wraps(func)
-    async def wrapper(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        chat_type = update.effective_chat.type
-        
-        # Check if command is in private chat
-        if chat_type != 'private':
-            logger.warning(
-                f"User command '{func.__name__}' blocked in {chat_type} chat. "
-                f"Only allowed in private chat."
-            )
-            await update.message.reply_text(
-                "⚠️ This command can only be used in private chat with the bot.\n\n"
-                "Please message me directly: @balance_transfer_tg_bot"
-            )
-            return
+    label = f"{'Admin' if require_admin else 'User'} {'callback' if is_callback else 'command'}"
+    blocked_message = _BLOCKED_MESSAGES[(require_admin, is_callback)]
+    
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+            chat = update.callback_query.message.chat if is_callback else update.effective_chat
+            
+            if require_admin:
+                # Get admin group ID from database or config
+                chat_id = str(chat.id)
+                admin_group_id = self.db.get_setting_cached('admin_group_id') or Config.ADMIN_GROUP_ID
+                if chat_id == admin_group_id:
+                    return await func(self, update, context)
+                
+                logger.warning(
+                    f"{label} '{func.__name__}' blocked in chat {chat_id} "
+                    f"(type: {chat.type}). Only allowed in admin group."
+                )
+            else:
+                if chat.type == 'private':
+                    return await func(self, update, context)
+                
+                logger.warning(
+                    f"{label} '{func.__name__}' blocked in {chat.type} chat. "
+                    f"Only allowed in private chat."
+                )
+            
+            if is_callback:
+                await update.callback_query.answer(blocked_message, show_alert=True)
+            else:
+                await update.message.reply_text(blocked_message)
         
-        # Execute the command
-        return await func(self, update, context)
+        return wrapper
     
-    return wrapper
+    return decorator
 
 
-def admin_group_only_callback(func):
-    """
-    Decorator for callback queries that should only work in admin group
-    """
-    @wraps(func)
-    async def wrapper(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        query = update.callback_query
-        chat_id = str(query.message.chat.id)
-        chat_type = query.message.chat.type
-        
-        # Get admin group ID from database or config
-        admin_group_id = self.db.get_setting('admin_group_id') or Config.ADMIN_GROUP_ID
-        
-        # Check if callback is in admin group
-        if chat_id != admin_group_id:
-            logger.warning(
-                f"Admin callback '{func.__name__}' blocked in chat {chat_id} "
-                f"(type: {chat_type}). Only allowed in admin group."
-            )
-            await query.answer("⚠️ This action can only be performed in the admin group.", show_alert=True)
-            return
-        
-        # Execute the callback
-        return await func(self, update, context)
-    
-    return wrapper
+# Ensure command only runs in admin group (blocks execution in private chats)
+admin_only = _chat_guard(require_admin=True, is_callback=False)
 
+# Ensure command only runs in private chat with bot (blocks execution in groups)
+private_chat_only = _chat_guard(require_admin=False, is_callback=False)
 
-def private_chat_only_callback(func):
-    """
-    Decorator for callback queries that should only work in private chat
-    """
-    @wraps(func)
-    async def wrapper(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        query = update.callback_query
-        chat_type = query.message.chat.type
-        
-        # Check if callback is in private chat
-        if chat_type != 'private':
-            logger.warning(
-                f"User callback '{func.__name__}' blocked in {chat_type} chat. "
-                f"Only allowed in private chat."
-            )
-            await query.answer("⚠️ This action can only be performed in private chat with the bot.", show_alert=True)
-            return
-        
-        # Execute the callback
-        return await func(self, update, context)
-    
-    return wrapper
+# Callback queries that should only work in admin group
+admin_group_only_callback = _chat_guard(require_admin=True, is_callback=True)
+
+# Callback queries that should only work in private chat
+private_chat_only_callback = _chat_guard(require_admin=False, is_callback=True)
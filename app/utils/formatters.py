@@ -2,6 +2,16 @@
 Formatting utilities
 """
 from datetime import datetime
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from app.services.database_service import Transaction
+
+_STATUS_EMOJI = {
+    'confirmed': '✅',
+    'pending': '⏳',
+    'cancelled': '❌'
+}
 
 
 class Formatters:
@@ -37,25 +47,21 @@ class Formatters:
         return dt.strftime('%Y-%m-%d %H:%M:%S')
     
     @staticmethod
-    def format_transaction_summary(transaction: tuple) -> str:
+    def format_transaction_summary(transaction: "Transaction") -> str:
         """
         Format transaction for display
         
         Args:
-            transaction: Transaction tuple from database
+            transaction: Transaction from database
             
         Returns:
             Formatted string
         """
-        txn_id = transaction[0]
-        thb_amount = transaction[6]
-        mmk_amount = transaction[7]
-        status = transaction[13]
+        txn_id = transaction.id
+        thb_amount = transaction.thb_amount
+        mmk_amount = transaction.mmk_amount
+        status = transaction.status
         
-        status_emoji = {
-            'confirmed': '✅',
-            'pending': '⏳',
-            'cancelled': '❌'
-        }.get(status, '❓')
+        status_emoji = _STATUS_EMOJI.get(status, '❓')
         
         return f"{status_emoji} #{txn_id} - {thb_amount} THB → {mmk_amount:,.0f} MMK - `{status}`"
@@ -3,6 +3,19 @@ Validation utilities
 """
 from typing import Optional
 
+from app.config.settings import Config
+
+
+# Translation table that drops thousands separators
+_NOCOMMA = str.maketrans('', '', ',')
+
+# Lower-cased copies of the configured bank lists, built once at import and
+# keyed by the identity of the list callers pass in
+_LOWERED_BANKS = {
+    id(banks): tuple(bank.lower() for bank in banks)
+    for banks in (Config.THAI_BANKS, Config.COMPANY_RECEIVING_BANKS, Config.MMK_BANKS)
+}
+
 
 class Validators:
     """Validation helper functions"""
@@ -19,11 +32,17 @@ class Validators:
             Float amount or None if invalid
         """
         try:
-            amount = float(amount_str.replace(',', ''))
+            # Only rebuild the string when there is a separator to strip
+            if ',' in amount_str:
+                amount_str = amount_str.translate(_NOCOMMA)
+            if not amount_str or amount_str.isspace():
+                return None
+            
+            amount = float(amount_str)
             if amount <= 0:
                 return None
             return amount
-        except (ValueError, AttributeError):
+        except (ValueError, TypeError, AttributeError):
             return None
     
     @staticmethod
@@ -63,4 +82,9 @@ class Validators:
         Returns:
             True if supported, False otherwise
         """
-        return any(bank.lower() in bank_name.lower() for bank in supported_banks)
+        bank_name = bank_name.lower()
+        lowered = _LOWERED_BANKS.get(id(supported_banks))
+        if lowered is None:
+            # Not one of the Config lists; lower-case it on the fly
+            return any(bank.lower() in bank_name for bank in supported_banks)
+        return any(bank in bank_name for bank in lowered)
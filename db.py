@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Shared SQLite connection for the maintenance scripts
+"""
+import sqlite3
+from typing import Dict
+
+DB_PATH = 'exchange_bot.db'
+
+# One connection per database file, kept open for the life of the process
+_connections: Dict[str, sqlite3.Connection] = {}
+
+def get_conn(path: str = DB_PATH) -> sqlite3.Connection:
+    """
+    Get the shared connection for a database file, opening it on first use
+    
+    Scripts run in the same process reuse the connection (and its page
+    cache) instead of reopening the file. The connection is in autocommit
+    mode; callers bracket their writes with BEGIN IMMEDIATE / COMMIT.
+    
+    Args:
+        path: Path to SQLite database file
+    
+    Returns:
+        Open sqlite3 connection
+    """
+    conn = _connections.get(path)
+    if conn is None:
+        conn = sqlite3.connect(path, isolation_level=None, cached_statements=128)
+        
+        # Same journal settings as the bot
+        conn.executescript("""
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA cache_size=-64000;
+        """)
+        _connections[path] = conn
+    return conn
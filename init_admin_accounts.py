@@ -5,6 +5,7 @@ Run this once to set up your receiving accounts
 """
 import sqlite3
 import sys
+from collections import namedtuple
 
 # Database path (auto-detect Docker or local)
 import os
@@ -13,61 +14,24 @@ if os.path.exists('/app/data/exchange_bot.db'):
 else:
     DB_PATH = 'data/exchange_bot.db'  # Local
 
+# Row layout matches the INSERT column order below
+AdminAccount = namedtuple(
+    'AdminAccount', ['currency', 'bank_name', 'account_number', 'account_name', 'balance']
+)
+
 # Admin bank accounts to add with initial balances
-ADMIN_ACCOUNTS = [
+ADMIN_ACCOUNTS = (
     # THB Accounts (Thai Baht receiving accounts)
-    {
-        'currency': 'THB',
-        'bank_name': 'KrungthaiBank',
-        'account_number': '123-4-56789-0',
-        'account_name': 'MissThinZarHtet',
-        'balance': 150000.0
-    },
-    {
-        'currency': 'THB',
-        'bank_name': 'PromptPay',
-        'account_number': '123-45678901-4093',
-        'account_name': 'ThuKhaZaw',
-        'balance': 150000.0
-    },
-    {
-        'currency': 'THB',
-        'bank_name': 'SiamCommercialBank',
-        'account_number': '884-2-123935',
-        'account_name': 'MinMyatNwe',
-        'balance': 150000.0
-    },
+    AdminAccount('THB', 'KrungthaiBank', '123-4-56789-0', 'MissThinZarHtet', 150000.0),
+    AdminAccount('THB', 'PromptPay', '123-45678901-4093', 'ThuKhaZaw', 150000.0),
+    AdminAccount('THB', 'SiamCommercialBank', '884-2-123935', 'MinMyatNwe', 150000.0),
     
     # MMK Accounts (Myanmar Kyat sending accounts)
-    {
-        'currency': 'MMK',
-        'bank_name': 'KBZ',
-        'account_number': '12345678901234',
-        'account_name': 'AdminKBZ',
-        'balance': 1500000.0
-    },
-    {
-        'currency': 'MMK',
-        'bank_name': 'AYA',
-        'account_number': '12345678901234',
-        'account_name': 'AdminAYA',
-        'balance': 1500000.0
-    },
-    {
-        'currency': 'MMK',
-        'bank_name': 'KPay',
-        'account_number': '09123456789',
-        'account_name': 'AdminKPay',
-        'balance': 1500000.0
-    },
-    {
-        'currency': 'MMK',
-        'bank_name': 'Wave',
-        'account_number': '09123456789',
-        'account_name': 'AdminWave',
-        'balance': 1500000.0
-    },
-]
+    AdminAccount('MMK', 'KBZ', '12345678901234', 'AdminKBZ', 1500000.0),
+    AdminAccount('MMK', 'AYA', '12345678901234', 'AdminAYA', 1500000.0),
+    AdminAccount('MMK', 'KPay', '09123456789', 'AdminKPay', 1500000.0),
+    AdminAccount('MMK', 'Wave', '09123456789', 'AdminWave', 1500000.0),
+)
 
 def init_accounts():
     """Initialize admin bank accounts"""
@@ -78,30 +42,31 @@ def init_accounts():
         print("🏦 Initializing admin bank accounts...")
         print()
         
-        for account in ADMIN_ACCOUNTS:
-            try:
-                cursor.execute("""
-                    INSERT OR IGNORE INTO admin_bank_accounts 
-                    (currency, bank_name, account_number, account_name, balance)
-                    VALUES (?, ?, ?, ?, ?)
-                """, (
-                    account['currency'],
-                    account['bank_name'],
-                    account['account_number'],
-                    account['account_name'],
-                    account.get('balance', 0.0)
-                ))
-                
-                if cursor.rowcount > 0:
-                    print(f"✅ Added: {account['currency']} | {account['bank_name']} | {account['account_name']}")
-                else:
-                    print(f"⏭️  Exists: {account['currency']} | {account['bank_name']} | {account['account_name']}")
-                    
-            except Exception as e:
-                print(f"❌ Error adding {account['bank_name']}: {e}")
+        # Remember which of our accounts are already there so we can report added vs. existing
+        placeholders = ", ".join("(?, ?, ?)" for _ in ADMIN_ACCOUNTS)
+        cursor.execute(f"""
+            SELECT currency, bank_name, account_number FROM admin_bank_accounts 
+            WHERE (currency, bank_name, account_number) IN (VALUES {placeholders})
+        """, [value for account in ADMIN_ACCOUNTS for value in account[:3]])
+        existing = set(cursor.fetchall())
         
+        # Insert all accounts in one statement and one transaction
+        conn.execute("BEGIN")
+        cursor.executemany("""
+            INSERT INTO admin_bank_accounts 
+            (currency, bank_name, account_number, account_name, balance)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(currency, bank_name, account_number) DO NOTHING
+        """, ADMIN_ACCOUNTS)
+        added_count = cursor.rowcount
         conn.commit()
         
+        for account in ADMIN_ACCOUNTS:
+            if account[:3] in existing:
+                print(f"⏭️  Exists: {account.currency} | {account.bank_name} | {account.account_name}")
+            else:
+                print(f"✅ Added: {account.currency} | {account.bank_name} | {account.account_name}")
+        
         # Verify
         print()
         print("📋 Current admin accounts:")
@@ -117,7 +82,7 @@ def init_accounts():
             print(f"  ID:{acc[0]} | {acc[1]} | {acc[2]} | {acc[3]} | {acc[4]} | Balance: {acc[5]:,.2f}")
         
         print()
-        print(f"✅ Total: {len(accounts)} accounts initialized")
+        print(f"✅ Added {added_count}, total: {len(accounts)} accounts initialized")
         
         conn.close()
         
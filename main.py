@@ -9,6 +9,7 @@ logger = logging.getLogger(__name__)
 
 def main():
     """Main function to start the bot"""
+    bot = None
     try:
         from app.bot import ExchangeBot
         
@@ -22,6 +23,10 @@ def main():
     except Exception as e:
         logger.error(f"Fatal error: {e}", exc_info=True)
         sys.exit(1)
+    finally:
+        if bot is not None:
+            bot.db_service.close_all()
+            bot.ocr_service.close()
 
 
 if __name__ == "__main__":
@@ -20,11 +20,13 @@ def migrate_database():
         
         changes_made = False
         
+        # Add both columns in a single transaction
+        conn.execute("BEGIN")
+        
         # Add balance column if it doesn't exist
         if 'balance' not in columns:
             print("Adding 'balance' column to admin_bank_accounts table...")
             cursor.execute("ALTER TABLE admin_bank_accounts ADD COLUMN balance REAL DEFAULT 0.0")
-            conn.commit()
             print("✅ Successfully added 'balance' column!")
             changes_made = True
         else:
@@ -34,12 +36,13 @@ def migrate_database():
         if 'updated_at' not in columns:
             print("Adding 'updated_at' column to admin_bank_accounts table...")
             cursor.execute("ALTER TABLE admin_bank_accounts ADD COLUMN updated_at TIMESTAMP")
-            conn.commit()
             print("✅ Successfully added 'updated_at' column!")
             changes_made = True
         else:
             print("✅ Column 'updated_at' already exists!")
         
+        conn.commit()
+        
         if not changes_made:
             print("\n✅ All columns already exist, no migration needed!")
         
@@ -2,77 +2,86 @@
 """
 Migration script to copy balances from balances table to admin_bank_accounts table
 """
-import sqlite3
 import sys
 
+from db import get_conn
+
 def migrate_balances():
     """Copy balances from balances table to admin_bank_accounts"""
     
-    db_path = 'exchange_bot.db'
-    
     try:
-        conn = sqlite3.connect(db_path)
+        conn = get_conn()
         cursor = conn.cursor()
         
-        # Get all balances from old table
-        cursor.execute("SELECT currency, bank, balance FROM balances")
-        old_balances = cursor.fetchall()
+        # Memory-map the file for the bulk update
+        cursor.execute("PRAGMA mmap_size=268435456")
         
+        # Stream balances from old table row by row
         print("Balances from old 'balances' table:")
-        for currency, bank, balance in old_balances:
-            print(f"  {currency} - {bank}: {balance:,.2f}")
+        sys.stdout.write("".join(
+            f"  {currency} - {bank}: {balance:,.2f}\n"
+            for currency, bank, balance in conn.execute("SELECT currency, bank, balance FROM balances")
+        ))
         
         print("\nMigrating balances to admin_bank_accounts...")
         
-        updated_count = 0
-        not_found = []
+        cursor.execute("BEGIN IMMEDIATE")
+        
+        # Index the lookup key of the correlated subquery below
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_balances_currency_bank ON balances(currency, bank)")
+        
+        # Copy every matching balance in one statement
+        cursor.execute("""
+            UPDATE admin_bank_accounts 
+            SET balance = COALESCE((
+                SELECT b.balance FROM balances b 
+                WHERE b.currency = admin_bank_accounts.currency 
+                AND b.bank = admin_bank_accounts.bank_name
+            ), balance)
+            WHERE (currency, bank_name) IN (SELECT currency, bank FROM balances)
+        """)
+        updated_count = cursor.rowcount
         
-        for currency, bank, balance in old_balances:
-            # Try to find matching account in admin_bank_accounts
-            cursor.execute("""
-                SELECT id FROM admin_bank_accounts 
-                WHERE currency = ? AND bank_name = ?
-            """, (currency, bank))
-            
-            result = cursor.fetchone()
-            
-            if result:
-                account_id = result[0]
-                cursor.execute("""
-                    UPDATE admin_bank_accounts 
-                    SET balance = ? 
-                    WHERE id = ?
-                """, (balance, account_id))
-                print(f"  ✓ Updated {currency} - {bank}: {balance:,.2f}")
-                updated_count += 1
+        cursor.execute("COMMIT")
+        
+        # Report each old balance, keeping only the unmatched ones
+        not_found = []
+        report = []
+        for currency, bank, balance, matched in conn.execute("""
+            SELECT b.currency, b.bank, b.balance, EXISTS(
+                SELECT 1 FROM admin_bank_accounts a 
+                WHERE a.currency = b.currency AND a.bank_name = b.bank
+            )
+            FROM balances b
+        """):
+            if matched:
+                report.append(f"  ✓ Updated {currency} - {bank}: {balance:,.2f}\n")
             else:
                 not_found.append((currency, bank, balance))
-                print(f"  ⚠️  No matching account for {currency} - {bank}")
-        
-        conn.commit()
+                report.append(f"  ⚠️  No matching account for {currency} - {bank}\n")
+        sys.stdout.write("".join(report))
         
         print(f"\n✅ Updated {updated_count} account(s)")
         
         if not_found:
             print(f"\n⚠️  {len(not_found)} balance(s) not migrated (no matching account):")
-            for currency, bank, balance in not_found:
-                print(f"  - {currency} - {bank}: {balance:,.2f}")
+            sys.stdout.write("".join(
+                f"  - {currency} - {bank}: {balance:,.2f}\n"
+                for currency, bank, balance in not_found
+            ))
         
         # Show final balances in admin_bank_accounts
-        cursor.execute("""
-            SELECT currency, bank_name, display_name, balance 
-            FROM admin_bank_accounts 
-            WHERE is_active = 1
-            ORDER BY currency, bank_name
-        """)
-        accounts = cursor.fetchall()
-        
         print("\nFinal balances in admin_bank_accounts:")
-        for currency, bank_name, display_name, balance in accounts:
-            display = display_name if display_name else bank_name
-            print(f"  {currency} - {display}: {balance:,.2f}")
+        sys.stdout.write("".join(
+            f"  {currency} - {display_name or bank_name}: {balance:,.2f}\n"
+            for currency, bank_name, display_name, balance in conn.execute("""
+                SELECT currency, bank_name, display_name, balance 
+                FROM admin_bank_accounts 
+                WHERE is_active = 1
+                ORDER BY currency, bank_name
+            """)
+        ))
         
-        conn.close()
         return True
         
     except Exception as e:
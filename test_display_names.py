@@ -10,7 +10,7 @@ from services.database_service import DatabaseService
 def test_display_names():
     """Test that display names are returned correctly"""
     
-    db = DatabaseService('app/data/exchange_bot.db')
+    db = DatabaseService('app/data/exchange_bot.db', pool_size=1, read_only=True)
     
     print("Testing get_balances() method:")
     print("=" * 60)
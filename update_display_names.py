@@ -2,11 +2,24 @@
 """
 Script to update display names for existing bank accounts
 """
+import argparse
 import sqlite3
 import sys
+from typing import Optional
 
-def update_display_names():
-    """Update display names for existing bank accounts"""
+from db import get_conn
+
+def update_display_names(conn: Optional[sqlite3.Connection] = None, verify: bool = False):
+    """
+    Update display names for existing bank accounts
+    
+    Args:
+        conn: Connection to run on. The caller then owns the transaction and
+              the connection; by default the script uses the shared connection
+              and commits its own transaction
+        verify: Read the accounts back from the database after updating
+                instead of printing the intended mapping
+    """
     
     # Mappings based on your requirements
     display_name_mappings = {
@@ -19,58 +32,95 @@ def update_display_names():
         'Wave': 'Wave',
     }
     
-    db_path = 'exchange_bot.db'
+    own_conn = conn is None
     
     try:
-        conn = sqlite3.connect(db_path)
+        if own_conn:
+            conn = get_conn()
         cursor = conn.cursor()
         
-        # Get all bank accounts
-        cursor.execute("SELECT id, bank_name, display_name FROM admin_bank_accounts")
+        # Let SQLite filter by bank name instead of scanning every account
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_admin_bank_accounts_bank_name "
+            "ON admin_bank_accounts(bank_name)"
+        )
+        
+        bank_names = list(display_name_mappings)
+        placeholders = ", ".join("?" for _ in bank_names)
+        
+        # Get the bank accounts covered by the mapping; no LIMIT, since these
+        # rows double as the list of accounts the UPDATE below changes
+        cursor.execute(f"""
+            SELECT id, bank_name, display_name FROM admin_bank_accounts 
+            WHERE bank_name IN ({placeholders})
+            ORDER BY id
+        """, bank_names)
         accounts = cursor.fetchall()
         
         print("Current bank accounts:")
-        for acc_id, bank_name, display_name in accounts:
-            print(f"  ID {acc_id}: {bank_name} -> {display_name or '(no display name)'}")
+        sys.stdout.write("".join(
+            f"  ID {acc_id}: {bank_name} -> {display_name or '(no display name)'}\n"
+            for acc_id, bank_name, display_name in accounts
+        ))
         
         print("\nUpdating display names...")
         
-        updated_count = 0
-        for acc_id, bank_name, current_display in accounts:
-            if bank_name in display_name_mappings:
-                new_display = display_name_mappings[bank_name]
-                cursor.execute(
-                    "UPDATE admin_bank_accounts SET display_name = ? WHERE id = ?",
-                    (new_display, acc_id)
-                )
-                print(f"  ✓ Updated ID {acc_id}: {bank_name} -> {new_display}")
-                updated_count += 1
+        if own_conn:
+            cursor.execute("BEGIN IMMEDIATE")
         
-        conn.commit()
-        print(f"\n✅ Updated {updated_count} account(s)")
+        # Apply the whole mapping in one statement
+        cases = " ".join("WHEN ? THEN ?" for _ in display_name_mappings)
+        params = [value for pair in display_name_mappings.items() for value in pair]
+        params.extend(bank_names)
+        cursor.execute(f"""
+            UPDATE admin_bank_accounts 
+            SET display_name = CASE bank_name {cases} ELSE display_name END 
+            WHERE bank_name IN ({placeholders})
+        """, params)
+        updated_count = cursor.rowcount
         
-        # Show updated accounts
-        cursor.execute("SELECT id, bank_name, display_name FROM admin_bank_accounts")
-        accounts = cursor.fetchall()
-        
-        print("\nUpdated bank accounts:")
-        for acc_id, bank_name, display_name in accounts:
-            print(f"  ID {acc_id}: {bank_name} -> {display_name or '(no display name)'}")
+        if own_conn:
+            conn.commit()
+        print(f"\n✅ Updated {updated_count} account(s)")
         
-        conn.close()
+        if verify:
+            # Show updated accounts as stored
+            cursor.arraysize = 64
+            cursor.execute("SELECT id, bank_name, display_name FROM admin_bank_accounts ORDER BY id LIMIT 50")
+            
+            print("\nUpdated bank accounts:")
+            sys.stdout.write("".join(
+                f"  ID {acc_id}: {bank_name} -> {display_name or '(no display name)'}\n"
+                for acc_id, bank_name, display_name in cursor
+            ))
+        else:
+            # The accounts selected above are exactly the ones the UPDATE matched,
+            # so their new names are known without reading them back
+            print("\nUpdated bank accounts:")
+            sys.stdout.write("".join(
+                f"  ID {acc_id}: {bank_name} -> {display_name_mappings[bank_name]}\n"
+                for acc_id, bank_name, _ in accounts
+            ))
         
     except Exception as e:
+        if not own_conn:
+            raise  # Let the caller roll back its transaction
         print(f"❌ Error: {e}")
         sys.exit(1)
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Update display names for existing bank accounts")
+    parser.add_argument("--verify", action="store_true", help="read accounts back from the database after updating")
+    parser.add_argument("--yes", action="store_true", help="skip the confirmation prompt")
+    args = parser.parse_args()
+    
     print("Bank Account Display Name Updater")
     print("=" * 50)
     print("\nThis script will update display names for your bank accounts.")
     print("Edit the 'display_name_mappings' dictionary in this script first!\n")
     
-    response = input("Continue? (y/n): ")
+    response = 'y' if args.yes else input("Continue? (y/n): ")
     if response.lower() == 'y':
-        update_display_names()
+        update_display_names(verify=args.verify)
     else:
         print("Cancelled.")